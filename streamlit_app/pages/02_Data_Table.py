@@ -6,7 +6,8 @@
 
 import streamlit as st
 import pandas as pd
-import requests
+
+from utils.openmeteo import load_open_meteo_data
 
 st.set_page_config(page_title="Data Table – Open-Meteo API", page_icon="📊", layout="wide")
 
@@ -20,59 +21,7 @@ st.caption(
 
 
 # -----------------------------
-# 1) Helper: call Open-Meteo API
-# -----------------------------
-@st.cache_data(ttl=60 * 60)  # cache for 1 hour
-def load_open_meteo_data(past_days: int = 7) -> pd.DataFrame:
-    """
-    Download hourly weather data from the Open-Meteo API.
-
-    We request ERA5 reanalysis / forecast for a point near Ås, Norway.
-    Only standard, public, no-auth data are used.
-    """
-    url = "https://api.open-meteo.com/v1/forecast"
-
-    params = {
-        "latitude": 59.66,   # approx. Ås / Oslo region
-        "longitude": 10.79,
-        "hourly": ",".join(
-            [
-                "temperature_2m",
-                "relative_humidity_2m",
-                "precipitation",
-                "wind_speed_10m",
-            ]
-        ),
-        "past_days": past_days,
-        "forecast_days": 0,
-        "timezone": "Europe/Oslo",
-    }
-
-    resp = requests.get(url, params=params, timeout=30)
-    resp.raise_for_status()
-    data = resp.json()
-
-    hourly = data.get("hourly", {})
-    times = hourly.get("time", [])
-
-    if not times:
-        raise ValueError("Open-Meteo API returned no hourly data.")
-
-    df = pd.DataFrame({"time": pd.to_datetime(times)})
-
-    for key in ["temperature_2m", "relative_humidity_2m", "precipitation", "wind_speed_10m"]:
-        if key in hourly:
-            df[key] = hourly[key]
-
-    # Add convenient date / hour columns
-    df["date"] = df["time"].dt.date
-    df["hour"] = df["time"].dt.hour
-
-    return df
-
-
-# -----------------------------
-# 2) Load data safely
+# 1) Load data safely (shared cached loader in utils/openmeteo.py)
 # -----------------------------
 with st.spinner("Downloading hourly weather data from Open-Meteo API..."):
     try:
@@ -88,12 +37,17 @@ st.success(f"✅ Loaded {len(df)} hourly observations from the last 7 days.")
 
 
 # -----------------------------
-# 3) Sidebar filters
+# 2) Sidebar filters
 # -----------------------------
 st.sidebar.markdown("### 🔎 Data Table Filters")
 
-dates_available = sorted(df["date"].unique())
-selected_date = st.sidebar.selectbox("Select date", options=dates_available, index=len(dates_available) - 1)
+dates_available = df["date"].drop_duplicates().tolist()
+selected_date = st.sidebar.selectbox(
+    "Select date",
+    options=dates_available,
+    index=len(dates_available) - 1,
+    format_func=lambda d: d.strftime("%Y-%m-%d"),
+)
 
 variables_all = [
     ("temperature_2m", "Temperature (°C)"),
@@ -114,27 +68,30 @@ selected_vars = st.sidebar.multiselect(
     format_func=lambda k: var_labels[k],
 )
 
-# Filter DataFrame for the selected date
-df_day = df[df["date"] == selected_date].copy()
+# Filter DataFrame for the selected date. "date" is datetime64, so this
+# is a single vectorized int64 comparison.
+df_day = df[df["date"] == selected_date]
 
-st.markdown(f"### 📅 Data for {selected_date}")
+st.markdown(f"### 📅 Data for {selected_date:%Y-%m-%d}")
 
 # -----------------------------
-# 4) Show table
+# 3) Show table
 # -----------------------------
 if df_day.empty:
     st.warning("No observations for this date.")
 else:
-    # Order columns: time, hour, selected variables
+    # Order columns: time, hour, selected variables. Arrow-backed dtypes
+    # make Streamlit's frame serialization to the frontend a memcpy.
     cols = ["time", "hour"] + selected_vars
+    view = df_day[cols].reset_index(drop=True).convert_dtypes(dtype_backend="pyarrow")
     st.dataframe(
-        df_day[cols].reset_index(drop=True),
+        view,
         height=400,
         use_container_width=True,
     )
 
     # -----------------------------
-    # 5) Line plot for selected variables
+    # 4) Line plot for selected variables
     # -----------------------------
     if selected_vars:
         st.markdown("### 📈 Hourly profile for selected variables")
@@ -149,7 +106,7 @@ else:
         st.info("Select at least one variable in the sidebar to see a line plot.")
 
 # -----------------------------
-# 6) Documentation expander
+# 5) Documentation expander
 # -----------------------------
 with st.expander("ℹ️ Data source & processing details"):
     st.markdown(
@@ -5,10 +5,22 @@
 # ---------------------------------------------------------
 
 import streamlit as st
+import numpy as np
 import pandas as pd
-import requests
 import altair as alt
 
+from utils.openmeteo import load_open_meteo_data
+
+try:
+    from tsdownsample import MinMaxLTTBDownsampler
+except ImportError:  # optional dependency – plot the raw samples instead
+    MinMaxLTTBDownsampler = None
+
+try:
+    import polars as pl
+except ImportError:  # optional dependency – pandas handles the reshape
+    pl = None
+
 
 st.markdown("## 📉 Plots")
 st.caption(
@@ -18,56 +30,7 @@ st.caption(
 
 
 # -----------------------------
-# 1) Helper: call Open-Meteo API
-# -----------------------------
-@st.cache_data(ttl=60 * 60)
-def load_open_meteo_data(past_days: int = 7) -> pd.DataFrame:
-    """
-    Download hourly weather data from the Open-Meteo API
-    for the last `past_days` days near Ås / Oslo.
-    """
-    url = "https://api.open-meteo.com/v1/forecast"
-
-    params = {
-        "latitude": 59.66,
-        "longitude": 10.79,
-        "hourly": ",".join(
-            [
-                "temperature_2m",
-                "relative_humidity_2m",
-                "precipitation",
-                "wind_speed_10m",
-            ]
-        ),
-        "past_days": past_days,
-        "forecast_days": 0,
-        "timezone": "Europe/Oslo",
-    }
-
-    resp = requests.get(url, params=params, timeout=30)
-    resp.raise_for_status()
-    data = resp.json()
-
-    hourly = data.get("hourly", {})
-    times = hourly.get("time", [])
-
-    if not times:
-        raise ValueError("Open-Meteo API returned no hourly data.")
-
-    df = pd.DataFrame({"time": pd.to_datetime(times)})
-
-    for key in ["temperature_2m", "relative_humidity_2m", "precipitation", "wind_speed_10m"]:
-        if key in hourly:
-            df[key] = hourly[key]
-
-    df["date"] = df["time"].dt.date
-    df["hour"] = df["time"].dt.hour
-
-    return df
-
-
-# -----------------------------
-# 2) Sidebar controls
+# 1) Sidebar controls
 # -----------------------------
 st.sidebar.markdown("### 📉 Plot controls (Open-Meteo)")
 
@@ -102,7 +65,7 @@ if not selected_vars:
 
 
 # -----------------------------
-# 3) Load data
+# 2) Load data (shared cached loader in utils/openmeteo.py)
 # -----------------------------
 with st.spinner(f"Downloading last {days} days from the Open-Meteo API..."):
     try:
@@ -118,7 +81,7 @@ st.success(f"✅ Loaded {len(df)} hourly observations from the last {days} days.
 
 
 # -----------------------------
-# 4) Prepare data for plotting
+# 3) Prepare data for plotting
 # -----------------------------
 if agg_mode == "Daily":
     st.markdown("### 📆 Daily aggregates")
@@ -131,26 +94,52 @@ if agg_mode == "Daily":
     }
 
     df_daily = df.groupby("date").agg(agg_dict).reset_index()
-    df_plot = df_daily[["date"] + selected_vars].copy()
+    df_plot = df_daily[["date"] + selected_vars]
     time_col = "date"
 else:
     st.markdown("### ⏱ Hourly profile")
-    df_plot = df[["time"] + selected_vars].copy()
+    df_plot = df[["time"] + selected_vars]
     time_col = "time"
 
-# Long format for Altair
-long_df = df_plot.melt(
-    id_vars=[time_col],
-    value_vars=selected_vars,
-    var_name="variable",
-    value_name="value",
-)
+# Downsample long series before they reach the chart: ~1000 MinMaxLTTB
+# points per variable are visually indistinguishable from the raw line
+# but keep the Vega-Lite JSON payload small.
+if MinMaxLTTBDownsampler is not None and len(df_plot) > 2000:
+    ts = pd.to_datetime(df_plot[time_col]).to_numpy()
+    keep = np.zeros(len(df_plot), dtype=bool)
+    for col in selected_vars:
+        idx = MinMaxLTTBDownsampler().downsample(
+            ts, df_plot[col].to_numpy(), n_out=1000
+        )
+        keep[idx] = True
+    df_plot = df_plot.loc[keep]
+
+# Long format for Altair. Polars unpivots on all cores when it is
+# installed; otherwise pandas melt does the same reshape.
+if pl is not None:
+    long_df = (
+        pl.from_pandas(df_plot)
+        .unpivot(
+            index=[time_col],
+            on=selected_vars,
+            variable_name="variable",
+            value_name="value",
+        )
+        .to_pandas()
+    )
+else:
+    long_df = df_plot.melt(
+        id_vars=[time_col],
+        value_vars=selected_vars,
+        var_name="variable",
+        value_name="value",
+    )
 
 long_df["variable_label"] = long_df["variable"].map(var_labels)
 
 
 # -----------------------------
-# 5) Build Altair line chart
+# 4) Build Altair line chart
 # -----------------------------
 x_title = "Date" if time_col == "date" else "Time"
 
@@ -175,7 +164,7 @@ st.altair_chart(chart, use_container_width=True)
 
 
 # -----------------------------
-# 6) Quick stats
+# 5) Quick stats
 # -----------------------------
 with st.expander("📌 Summary statistics for selected variables"):
     stats = (
@@ -185,11 +174,12 @@ with st.expander("📌 Summary statistics for selected variables"):
         [["mean", "median", "min", "max"]]
     )
     stats.index = [var_labels[i] for i in stats.index]
+    stats = stats.convert_dtypes(dtype_backend="pyarrow")
     st.dataframe(stats.style.format("{:.2f}"), use_container_width=True)
 
 
 # -----------------------------
-# 7) Documentation
+# 6) Documentation
 # -----------------------------
 with st.expander("ℹ️ Details about this page"):
     st.markdown(
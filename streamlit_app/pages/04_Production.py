@@ -1,57 +1,186 @@
+import io
+
 import streamlit as st
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+import matplotlib as mpl
+
+mpl.use("Agg")  # headless raster backend; no GUI event loop in a server app
+
+from matplotlib.figure import Figure
+
+from utils.elhub import load_elhub_2021_from_api
+
+# The pie and line charts on this page are the assignment's matplotlib
+# deliverables and stay server-rendered; the weather pages already ship
+# Vega-Lite specs and render client-side.
+#
+# Cheaper Agg rendering for the hourly line plot: drop near-collinear
+# vertices aggressively and process paths in large chunks.
+mpl.rcParams["path.simplify"] = True
+mpl.rcParams["path.simplify_threshold"] = 1.0
+mpl.rcParams["agg.path.chunksize"] = 10000
+
+MONTH_NAMES = {
+    1: "January",
+    2: "February",
+    3: "March",
+    4: "April",
+    5: "May",
+    6: "June",
+    7: "July",
+    8: "August",
+    9: "September",
+    10: "October",
+    11: "November",
+    12: "December",
+}
+
+
+@st.cache_data
+def annual_production(df: pd.DataFrame) -> pd.DataFrame:
+    """Total production per (priceArea, productionGroup), aggregated once."""
+    return (
+        df.groupby(
+            ["priceArea", "productionGroup"], as_index=False, observed=True
+        )["quantityKwh"]
+        .sum()
+    )
 
-# ------------------------------------------------------
-# 1) Download Elhub data LIVE from the public CSV API
-# ------------------------------------------------------
 
-ELHUB_API_URL = (
-    "https://data.elhub.no/download/production_per_group_mba_hour/"
-    "production_per_group_mba_hour-all-en-0000-00-00.csv"
-)
+@st.cache_data
+def production_by_area_month(df: pd.DataFrame) -> pd.Series:
+    """
+    Hourly production as a Series indexed by (priceArea, month,
+    startTime, productionGroup) and sorted, so widget interactions slice
+    it with a binary search instead of masking the full year.
+    """
+    return (
+        df.groupby(
+            ["priceArea", "month", "startTime", "productionGroup"], observed=True
+        )["quantityKwh"]
+        .sum()
+        .sort_index()
+    )
 
 
-@st.cache_data(show_spinner="Downloading Elhub production data from API ...")
-def load_elhub_2021_from_api() -> pd.DataFrame:
+@st.cache_data(max_entries=64)
+def render_pie_png(area: str, _annual: pd.DataFrame) -> bytes | None:
     """
-    Download PRODUCTION_PER_GROUP_MBA_HOUR directly from Elhub's
-    public CSV API, clean it and return only the columns required
-    by the assignment for the year 2021.
+    Rendered pie chart as PNG bytes, memoized per price area. Revisiting
+    an area replays the cached image instead of re-running matplotlib.
+    The frame is passed underscore-prefixed so Streamlit keys the cache
+    on the selection only and never hashes the data.
     """
-    # Raw download (English CSV)
-    raw = pd.read_csv(ELHUB_API_URL)
+    yearly_by_group = (
+        _annual[_annual["priceArea"] == area]
+        .sort_values("quantityKwh", ascending=False)
+    )
 
-    # The English file currently has these columns:
-    # ['START_TIME', 'END_TIME', 'PRICE_AREA',
-    #  'PRODUCTION_GROUP', 'VOLUME_KWH']
-    rename_map = {
-        "START_TIME": "startTime",
-        "END_TIME": "endTime",
-        "PRICE_AREA": "priceArea",
-        "PRODUCTION_GROUP": "productionGroup",
-        "VOLUME_KWH": "quantityKwh",
-    }
-    raw = raw.rename(columns=rename_map)
+    if yearly_by_group.empty:
+        return None
+
+    labels = yearly_by_group["productionGroup"].tolist()
+    values = yearly_by_group["quantityKwh"].tolist()
+
+    # Precompute the wedge labels once instead of having matplotlib call
+    # a percent formatter per wedge during the draw; this also keeps
+    # rounding under our control.
+    total = sum(values)
+    pct_labels = iter(f"{v / total * 100:.1f}%" for v in values)
+
+    # Build the figure through the OO API: it is garbage-collected when
+    # this function returns instead of accumulating in pyplot's global
+    # figure registry across reruns.
+    fig1 = Figure(figsize=(5, 5))
+    ax1 = fig1.subplots()
+    wedges, texts, autotexts = ax1.pie(
+        values,
+        labels=None,  # we'll use legend instead
+        autopct=lambda _pct: next(pct_labels),
+        startangle=90,
+    )
+    ax1.axis("equal")
+    ax1.set_title(f"Total production 2021 – {area}")
+
+    # Show legend for readability
+    ax1.legend(
+        wedges,
+        labels,
+        title="Production group",
+        bbox_to_anchor=(1.05, 0.5),
+        loc="center left",
+    )
 
-    # Parse timestamps and keep only 2021
-    raw["startTime"] = pd.to_datetime(raw["startTime"], utc=True, errors="coerce")
+    buf = io.BytesIO()
+    fig1.savefig(buf, format="png", bbox_inches="tight")
+    return buf.getvalue()
 
-    df_2021 = raw.loc[
-        raw["startTime"].dt.year == 2021,
-        ["priceArea", "productionGroup", "startTime", "quantityKwh"],
-    ].copy()
 
-    # Make sure quantity is numeric
-    df_2021["quantityKwh"] = pd.to_numeric(
-        df_2021["quantityKwh"], errors="coerce"
-    ).fillna(0.0)
+@st.cache_data(max_entries=256)
+def render_lines_png(
+    area: str, month: int, groups: tuple, _agg: pd.Series
+) -> bytes | None:
+    """
+    Rendered hourly line plot as PNG bytes, memoized per
+    (area, month, groups) selection. The caller normalizes the group
+    list to a sorted tuple so equivalent pill selections share one
+    cache entry; the aggregate itself is underscore-prefixed and
+    therefore not hashed per rerun.
+    """
+    # The (area, month) rows form one contiguous run in the presorted
+    # aggregate; locate its boundaries by binary search and take an
+    # iloc view — no boolean mask over the year, and a missing key just
+    # yields an empty range.
+    lo, hi = _agg.index.slice_locs((area, month), (area, month))
+    month_slice = _agg.iloc[lo:hi].droplevel(["priceArea", "month"])
+
+    # Membership test on the int8 category codes instead of hashing the
+    # selected group names against every row's string value.
+    groups_idx = month_slice.index.get_level_values("productionGroup")
+    sel_codes = groups_idx.categories.get_indexer(groups)
+    sel_codes = sel_codes[sel_codes >= 0]
+    df_month = month_slice[
+        np.isin(groups_idx.codes, sel_codes.astype(groups_idx.codes.dtype))
+    ].reset_index()
 
-    return df_2021
+    if df_month.empty:
+        return None
+
+    fig2 = Figure(figsize=(6, 4))
+    ax2 = fig2.subplots()
+    # Fix both axes up front so matplotlib skips the bounds
+    # recomputation it would otherwise do for each plot call.
+    ax2.set_xlim(df_month["startTime"].min(), df_month["startTime"].max())
+    ax2.set_ylim(0.0, float(df_month["quantityKwh"].max()) * 1.05)
+    ax2.set_autoscale_on(False)
+
+    # Draw each group from its dense per-group rows; no NaN-padded
+    # wide frame is allocated just to be iterated column by column.
+    # The month slice is already time-ordered (sorted at load and in
+    # the cached aggregate), so no per-group sort is needed.
+    for group, sub in df_month.groupby(
+        "productionGroup", observed=True, sort=False
+    ):
+        ax2.plot(
+            sub["startTime"].to_numpy(),
+            sub["quantityKwh"].to_numpy(),
+            label=str(group),
+        )
+
+    ax2.set_title(f"Hourly production – {MONTH_NAMES[month]} 2021 – {area}")
+    ax2.set_xlabel("Time")
+    ax2.set_ylabel("Production (kWh)")
+    ax2.tick_params(axis="x", rotation=45)
+    ax2.legend(fontsize=8)
+
+    buf = io.BytesIO()
+    fig2.savefig(buf, format="png", bbox_inches="tight")
+    return buf.getvalue()
 
 
 # ------------------------------------------------------
-# 2) Page layout
+# 1) Page layout
 # ------------------------------------------------------
 
 st.title("Elhub production – 2021")
@@ -74,8 +203,14 @@ if df_2021.empty:
     st.error("Dataset is empty after filtering to 2021. Please check the API file.")
     st.stop()
 
-price_areas = sorted(df_2021["priceArea"].dropna().unique().tolist())
-groups_all = sorted(df_2021["productionGroup"].dropna().unique().tolist())
+# Aggregate once (cached); widget interactions below only slice these.
+annual = annual_production(df_2021)
+agg = production_by_area_month(df_2021)
+
+# The categorical dtypes already hold sorted, unique category lists, so
+# the widget options cost nothing — no full-column scan per rerun.
+price_areas = df_2021["priceArea"].cat.categories.tolist()
+groups_all = df_2021["productionGroup"].cat.categories.tolist()
 
 st.write(f"Available price areas: `{', '.join(price_areas)}`")
 
@@ -83,7 +218,7 @@ col_left, col_right = st.columns(2)
 
 
 # ------------------------------------------------------
-# 3) LEFT COLUMN – Pie chart: total 2021 production per group
+# 2) LEFT COLUMN – Pie chart: total 2021 production per group
 # ------------------------------------------------------
 with col_left:
     st.subheader("Total yearly production by group")
@@ -92,67 +227,24 @@ with col_left:
         "Select price area:", price_areas, index=0, horizontal=False
     )
 
-    subset_area = df_2021[df_2021["priceArea"] == price_area_choice]
-
-    yearly_by_group = (
-        subset_area.groupby("productionGroup", as_index=False)["quantityKwh"]
-        .sum()
-        .sort_values("quantityKwh", ascending=False)
-    )
+    pie_png = render_pie_png(price_area_choice, annual)
 
-    if yearly_by_group.empty:
+    if pie_png is None:
         st.info("No data available for this price area in 2021.")
     else:
-        labels = yearly_by_group["productionGroup"].tolist()
-        values = yearly_by_group["quantityKwh"].tolist()
-
-        fig1, ax1 = plt.subplots(figsize=(5, 5))
-        wedges, texts, autotexts = ax1.pie(
-            values,
-            labels=None,  # we'll use legend instead
-            autopct="%1.1f%%",
-            startangle=90,
-        )
-        ax1.axis("equal")
-        ax1.set_title(f"Total production 2021 – {price_area_choice}")
-
-        # Show legend for readability
-        ax1.legend(
-            wedges,
-            labels,
-            title="Production group",
-            bbox_to_anchor=(1.05, 0.5),
-            loc="center left",
-        )
-
-        st.pyplot(fig1)
+        st.image(pie_png, use_container_width=True)
 
 
 # ------------------------------------------------------
-# 4) RIGHT COLUMN – Line plot for selected month & groups
+# 3) RIGHT COLUMN – Line plot for selected month & groups
 # ------------------------------------------------------
 with col_right:
     st.subheader("Hourly production for a selected month")
 
-    month_names = {
-        1: "January",
-        2: "February",
-        3: "March",
-        4: "April",
-        5: "May",
-        6: "June",
-        7: "July",
-        8: "August",
-        9: "September",
-        10: "October",
-        11: "November",
-        12: "December",
-    }
-
     month_choice = st.selectbox(
         "Select month:",
-        options=list(month_names.keys()),
-        format_func=lambda m: month_names[m],
+        options=list(MONTH_NAMES.keys()),
+        format_func=lambda m: MONTH_NAMES[m],
         index=0,
     )
 
@@ -163,47 +255,22 @@ with col_right:
         default=groups_all,
     )
 
-    # Filter data
-    mask = (
-        (df_2021["priceArea"] == price_area_choice)
-        & (df_2021["startTime"].dt.month == month_choice)
-        & (df_2021["productionGroup"].isin(selected_groups))
+    # Sorted tuple so e.g. ("hydro", "wind") and ("wind", "hydro") hit
+    # the same cache entry.
+    lines_png = render_lines_png(
+        price_area_choice, month_choice, tuple(sorted(selected_groups)), agg
     )
-    df_month = df_2021.loc[mask].copy()
 
-    if df_month.empty:
+    if lines_png is None:
         st.info(
             f"No data available for {price_area_choice} in "
-            f"{month_names[month_choice]} 2021 with the selected groups."
+            f"{MONTH_NAMES[month_choice]} 2021 with the selected groups."
         )
     else:
-        # Pivot so each production group becomes a separate line
-        df_pivot = (
-            df_month.pivot_table(
-                index="startTime",
-                columns="productionGroup",
-                values="quantityKwh",
-                aggfunc="sum",
-            )
-            .sort_index()
-        )
-
-        fig2, ax2 = plt.subplots(figsize=(6, 4))
-        for col in df_pivot.columns:
-            ax2.plot(df_pivot.index, df_pivot[col], label=col)
-
-        ax2.set_title(
-            f"Hourly production – {month_names[month_choice]} 2021 – {price_area_choice}"
-        )
-        ax2.set_xlabel("Time")
-        ax2.set_ylabel("Production (kWh)")
-        ax2.tick_params(axis="x", rotation=45)
-        ax2.legend(fontsize=8)
-
-        st.pyplot(fig2)
+        st.image(lines_png, use_container_width=True)
 
 # ------------------------------------------------------
-# 5) Source information
+# 4) Source information
 # ------------------------------------------------------
 with st.expander("Data source & processing (Elhub)", expanded=False):
     st.markdown(
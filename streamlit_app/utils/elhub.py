@@ -0,0 +1,164 @@
+# streamlit_app/utils/elhub.py
+# ---------------------------------------------------------
+# Shared Elhub production-data loader. Keeping the cached
+# loader in one module means a single cache entry serves any
+# page (or future page) that needs the 2021 dataset.
+# ---------------------------------------------------------
+
+import json
+from pathlib import Path
+from urllib.request import urlopen
+
+import streamlit as st
+import pandas as pd
+import requests
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+# Copy-on-write makes slices of the shared cached frame plain views that
+# are safe by default, so no defensive .copy() (a full memcpy of the
+# selection) is ever needed downstream.
+pd.options.mode.copy_on_write = True
+
+ELHUB_API_URL = (
+    "https://data.elhub.no/download/production_per_group_mba_hour/"
+    "production_per_group_mba_hour-all-en-0000-00-00.csv"
+)
+
+# On-disk cache of the filtered 2021 frame. Cold Streamlit starts read
+# this small typed Parquet file instead of re-downloading and re-parsing
+# the full multi-year CSV.
+_CACHE_DIR = Path.home() / ".cache" / "elhub"
+_PARQUET_PATH = _CACHE_DIR / "elhub_2021.parquet"
+# Sidecar recording the ETag/Last-Modified of the CSV the Parquet file
+# was built from, so a cheap HEAD request can validate the cache.
+_META_PATH = _CACHE_DIR / "meta.json"
+
+
+def _remote_validator() -> str | None:
+    """
+    ETag (or Last-Modified) of the published CSV, from a HEAD request.
+    Returns None when the header is missing or the request fails, in
+    which case callers fall back to whatever cache they have.
+    """
+    try:
+        headers = requests.head(
+            ELHUB_API_URL, timeout=10, allow_redirects=True
+        ).headers
+        return headers.get("ETag") or headers.get("Last-Modified")
+    except requests.RequestException:
+        return None
+
+
+@st.cache_resource(
+    ttl=24 * 3600,  # Elhub republishes daily; refresh the in-process entry then
+    show_spinner="Downloading Elhub production data from API ...",
+)
+def load_elhub_2021_from_api() -> pd.DataFrame:
+    """
+    Download PRODUCTION_PER_GROUP_MBA_HOUR directly from Elhub's
+    public CSV API, clean it and return only the columns required
+    by the assignment for the year 2021.
+
+    cache_resource returns the live cached frame without the per-hit
+    pickle/copy that cache_data pays on multi-MB objects, so callers
+    must treat it as read-only (the Production page only slices and
+    aggregates it).
+    """
+    validator = _remote_validator()
+
+    if _PARQUET_PATH.exists():
+        try:
+            stored = json.loads(_META_PATH.read_text()).get("etag")
+        except (OSError, ValueError):
+            stored = None
+        # Reuse the Parquet file when the published CSV is unchanged —
+        # or unverifiable, since serving yesterday's data beats
+        # re-downloading tens of MB on a flaky HEAD. Only a changed
+        # validator forces the full fetch below.
+        if validator is None or (stored is not None and stored == validator):
+            cached = pd.read_parquet(_PARQUET_PATH)
+            # Ignore caches written before the month column existed.
+            if "month" in cached.columns:
+                return cached
+
+    # Stream the multi-year CSV in blocks on Arrow's multithreaded
+    # reader and keep only 2021 rows per batch, so peak memory is one
+    # block rather than the full file. include_columns keeps the unused
+    # END_TIME column from ever being materialized.
+    read_options = pacsv.ReadOptions(block_size=16 << 20, use_threads=True)
+    convert_options = pacsv.ConvertOptions(
+        include_columns=["START_TIME", "PRICE_AREA", "PRODUCTION_GROUP", "VOLUME_KWH"],
+        column_types={"VOLUME_KWH": pa.float32()},
+    )
+
+    schema = pa.schema(
+        [
+            ("START_TIME", pa.timestamp("us", tz="UTC")),
+            ("PRICE_AREA", pa.string()),
+            ("PRODUCTION_GROUP", pa.string()),
+            ("VOLUME_KWH", pa.float32()),
+        ]
+    )
+
+    # Two-sided timestamp bounds compare raw int64 values directly,
+    # instead of extracting a year from every row first.
+    lo = pa.scalar(pd.Timestamp("2021-01-01", tz="UTC"), type=pa.timestamp("us", tz="UTC"))
+    hi = pa.scalar(pd.Timestamp("2022-01-01", tz="UTC"), type=pa.timestamp("us", tz="UTC"))
+
+    batches = []
+    with urlopen(ELHUB_API_URL, timeout=60) as resp:
+        reader = pacsv.open_csv(
+            resp, read_options=read_options, convert_options=convert_options
+        )
+        for batch in reader:
+            start = pc.cast(
+                batch.column("START_TIME"), pa.timestamp("us", tz="UTC"), safe=False
+            )
+            mask = pc.and_(pc.greater_equal(start, lo), pc.less(start, hi))
+            filtered = pa.record_batch(
+                {
+                    "START_TIME": start.filter(mask),
+                    "PRICE_AREA": batch.column("PRICE_AREA").filter(mask),
+                    "PRODUCTION_GROUP": batch.column("PRODUCTION_GROUP").filter(mask),
+                    "VOLUME_KWH": batch.column("VOLUME_KWH").filter(mask),
+                }
+            )
+            if filtered.num_rows:
+                batches.append(filtered)
+
+    tbl = pa.Table.from_batches(batches, schema=schema) if batches else schema.empty_table()
+    tbl = tbl.rename_columns(["startTime", "priceArea", "productionGroup", "quantityKwh"])
+
+    df_2021 = tbl.to_pandas()[
+        ["priceArea", "productionGroup", "startTime", "quantityKwh"]
+    ]
+
+    # Arrow parses the quantity straight into float32 (plenty for hourly
+    # kWh, half the bandwidth of float64), so no text re-coercion or
+    # downcast pass is needed — just fill the odd missing reading.
+    df_2021["quantityKwh"] = df_2021["quantityKwh"].fillna(0.0)
+
+    # The two string columns have tiny cardinality; as categoricals the
+    # masks and groupbys below run on small integer codes instead of
+    # hashing Python string objects on every rerun.
+    df_2021["priceArea"] = df_2021["priceArea"].astype("category")
+    df_2021["productionGroup"] = df_2021["productionGroup"].astype("category")
+
+    # Sort once at load (the file arrives near-sorted, so the stable sort
+    # is cheap); interactive slices downstream are then already
+    # time-ordered and need no per-rerun sorting.
+    df_2021.sort_values("startTime", kind="stable", inplace=True)
+    df_2021.reset_index(drop=True, inplace=True)
+
+    # Compact month key: filters and groupbys on it touch one int8 per
+    # row instead of re-extracting the month from 8-byte timestamps.
+    df_2021["month"] = df_2021["startTime"].dt.month.astype("int8")
+
+    _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    df_2021.to_parquet(_PARQUET_PATH, compression="zstd")
+    if validator is not None:
+        _META_PATH.write_text(json.dumps({"etag": validator}))
+
+    return df_2021
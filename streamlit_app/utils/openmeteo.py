@@ -0,0 +1,91 @@
+# streamlit_app/utils/openmeteo.py
+# ---------------------------------------------------------
+# Shared Open-Meteo loader for the Data Table and Plots
+# pages. A single cached function means both pages share one
+# st.cache_data entry (and one API call) per past_days value.
+# ---------------------------------------------------------
+
+import streamlit as st
+import pandas as pd
+import requests
+
+# Copy-on-write lets the pages filter the shared cached frame through
+# cheap views instead of defensive copies.
+pd.options.mode.copy_on_write = True
+
+try:
+    import requests_cache
+
+    # On-disk HTTP cache so cold Streamlit starts reuse the last JSON
+    # response instead of re-downloading it; stale entries are served if
+    # the API is briefly unavailable.
+    _session = requests_cache.CachedSession(
+        "openmeteo_cache",
+        backend="sqlite",
+        expire_after=60 * 60,
+        stale_if_error=True,
+    )
+except ImportError:  # optional dependency – fall back to plain requests
+    _session = requests.Session()
+
+
+@st.cache_resource(ttl=60 * 60, show_spinner=False)
+def load_open_meteo_data(
+    past_days: int = 7, lat: float = 59.66, lon: float = 10.79
+) -> pd.DataFrame:
+    """
+    Download hourly weather data from the Open-Meteo API for the last
+    `past_days` days at the given coordinates (default: near Ås, Norway).
+    Only standard, public, no-auth data are used.
+
+    cache_resource hands back the live cached object without re-hashing
+    or copying it on every hit, so callers must treat the returned frame
+    as read-only (the pages only filter / reshape it).
+    """
+    url = "https://api.open-meteo.com/v1/forecast"
+
+    params = {
+        "latitude": lat,
+        "longitude": lon,
+        "hourly": ",".join(
+            [
+                "temperature_2m",
+                "relative_humidity_2m",
+                "precipitation",
+                "wind_speed_10m",
+            ]
+        ),
+        "past_days": past_days,
+        "forecast_days": 0,
+        "timezone": "Europe/Oslo",
+    }
+
+    resp = _session.get(url, params=params, timeout=30)
+    resp.raise_for_status()
+    data = resp.json()
+
+    hourly = data.get("hourly", {})
+    times = hourly.get("time", [])
+
+    if not times:
+        raise ValueError("Open-Meteo API returned no hourly data.")
+
+    # Build the frame in one constructor call; appending columns one by
+    # one forces repeated internal block consolidation.
+    # The API returns ISO-8601 strings; naming the format keeps pandas on
+    # its C fast path instead of per-row format inference.
+    cols = {"time": pd.to_datetime(times, format="ISO8601")}
+    cols.update(
+        (key, hourly[key])
+        for key in ("temperature_2m", "relative_humidity_2m", "precipitation", "wind_speed_10m")
+        if key in hourly
+    )
+    df = pd.DataFrame(cols)
+
+    # Add convenient date / hour columns. "date" is kept as a
+    # midnight-floored datetime64 column (not datetime.date objects), so
+    # groupbys and filters on it hash int64 values in C.
+    df["date"] = df["time"].dt.floor("D")
+    df["hour"] = df["time"].dt.hour
+
+    return df